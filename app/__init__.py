@@ -1,4 +1,48 @@
 """
 BlogHub application package.
 """
+from flask import Flask
+from config import Config
+
 __version__ = '1.2.0'
+
+def create_app(config_class=Config):
+    """
+    Application factory pattern for creating Flask app instances.
+
+    Args:
+        config_class: Configuration class to use
+
+    Returns:
+        Flask application instance
+    """
+    # Imported here so the models and utils can be used without the routes
+    from app.routes import posts, auth, admin, api
+    from app.utils.cache import cache
+    from app.utils.database import init_db
+    from app.utils.json_provider import OrjsonProvider
+
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    app.json = OrjsonProvider(app)
+
+    # Initialize database and response cache
+    init_db(app)
+    cache.init_app(app)
+
+    # Register blueprints
+    app.register_blueprint(posts.bp)
+    app.register_blueprint(auth.bp)
+    app.register_blueprint(admin.bp)
+    app.register_blueprint(api.bp)
+
+    # Error handlers
+    @app.errorhandler(404)
+    def not_found(error):
+        return {"error": "Not found"}, 404
+
+    @app.errorhandler(500)
+    def internal_error(error):
+        return {"error": "Internal server error"}, 500
+
+    return app
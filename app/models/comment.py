@@ -16,6 +16,9 @@ class Comment:
         is_approved: Moderation status
     """
 
+    __slots__ = ('id', 'post_id', 'user_id', 'content', '_created_at',
+                 'is_approved', '_created_iso')
+
     def __init__(self, post_id, user_id, content):
         self.post_id = post_id
         self.user_id = user_id
@@ -23,6 +26,23 @@ class Comment:
         self.created_at = datetime.utcnow()
         self.is_approved = True  # Auto-approve for now
 
+    @property
+    def created_at(self):
+        """datetime: Comment creation timestamp."""
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value):
+        # Invalidate the cached ISO string; to_dict() re-renders it on demand
+        self._created_at = value
+        self._created_iso = None
+
+    def _created_isoformat(self):
+        """Return created_at as an ISO string, formatting it at most once per value."""
+        if self._created_iso is None:
+            self._created_iso = self._created_at.isoformat()
+        return self._created_iso
+
     def approve(self):
         """Approve the comment for display."""
         self.is_approved = True
@@ -38,7 +58,7 @@ class Comment:
             'post_id': self.post_id,
             'user_id': self.user_id,
             'content': self.content,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self._created_isoformat(),
             'is_approved': self.is_approved
         }
 
@@ -1,8 +1,12 @@
 """
 Post model for blog content.
 """
+import re
 from datetime import datetime
 
+_SLUG_STRIP = re.compile(r'[^\w\s-]')
+_SLUG_DASH = re.compile(r'[-\s]+')
+
 class Post:
     """
     Blog post model.
@@ -19,6 +23,9 @@ class Post:
         tags: Comma-separated tags
     """
 
+    __slots__ = ('id', 'title', 'content', 'author_id', 'slug', '_created_at',
+                 '_updated_at', 'published', 'tags', '_created_iso', '_updated_iso')
+
     def __init__(self, title, content, author_id, slug=None):
         self.title = title
         self.content = content
@@ -29,7 +36,42 @@ class Post:
         self.published = False
         self.tags = ""
 
-    def _generate_slug(self, title):
+    @property
+    def created_at(self):
+        """datetime: Post creation timestamp."""
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value):
+        # Invalidate the cached ISO string; to_dict() re-renders it on demand
+        self._created_at = value
+        self._created_iso = None
+
+    @property
+    def updated_at(self):
+        """datetime: Last update timestamp."""
+        return self._updated_at
+
+    @updated_at.setter
+    def updated_at(self, value):
+        # Invalidate the cached ISO string; to_dict() re-renders it on demand
+        self._updated_at = value
+        self._updated_iso = None
+
+    def _created_isoformat(self):
+        """Return created_at as an ISO string, formatting it at most once per value."""
+        if self._created_iso is None:
+            self._created_iso = self._created_at.isoformat()
+        return self._created_iso
+
+    def _updated_isoformat(self):
+        """Return updated_at as an ISO string, formatting it at most once per value."""
+        if self._updated_iso is None:
+            self._updated_iso = self._updated_at.isoformat()
+        return self._updated_iso
+
+    @staticmethod
+    def _generate_slug(title):
         """
         Generate a URL-friendly slug from the title.
 
@@ -39,11 +81,7 @@ class Post:
         Returns:
             str: URL-friendly slug
         """
-        import re
-        slug = title.lower()
-        slug = re.sub(r'[^\w\s-]', '', slug)
-        slug = re.sub(r'[-\s]+', '-', slug)
-        return slug
+        return _SLUG_DASH.sub('-', _SLUG_STRIP.sub('', title.lower()))
 
     def update(self, title=None, content=None, tags=None):
         """
@@ -80,8 +118,8 @@ class Post:
             'content': self.content,
             'slug': self.slug,
             'author_id': self.author_id,
-            'created_at': self.created_at.isoformat(),
-            'updated_at': self.updated_at.isoformat(),
+            'created_at': self._created_isoformat(),
+            'updated_at': self._updated_isoformat(),
             'published': self.published,
             'tags': self.tags
         }
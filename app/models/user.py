@@ -1,9 +1,38 @@
 """
 User model for authentication and authorization.
 """
+import os
+import secrets
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
-import hashlib
+from functools import lru_cache
+import bcrypt
+from werkzeug.security import check_password_hash
+
+# bcrypt work factor; tune so a single hash takes ~150ms on production hosts
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+
+# Verification results are memoized per process so repeat logins skip the
+# key-derivation step. Entries are keyed on (hash, plaintext), which keeps
+# recently used plaintext passwords in memory; set
+# PASSWORD_VERIFY_CACHE_SIZE=0 to disable the cache.
+_VERIFY_CACHE_SIZE = int(os.environ.get('PASSWORD_VERIFY_CACHE_SIZE', 1024))
+
+@lru_cache(maxsize=_VERIFY_CACHE_SIZE)
+def verify_password(password_hash: str, password: str) -> bool:
+    """
+    Check a password against a stored hash, caching the result.
+
+    Args:
+        password_hash: Stored password hash (includes the salt)
+        password: Plain text password to verify
+
+    Returns:
+        bool: True if password matches, False otherwise
+    """
+    if password_hash.startswith('$2'):
+        return bcrypt.checkpw(password.encode(), password_hash.encode())
+    # Hashes created by Werkzeug before the switch to bcrypt
+    return check_password_hash(password_hash, password)
 
 class User:
     """
@@ -19,6 +48,9 @@ class User:
         is_active: Account active status
     """
 
+    __slots__ = ('id', 'username', 'email', 'password_hash', '_created_at',
+                 'is_admin', 'is_active', '_created_iso')
+
     def __init__(self, username, email, password=None):
         self.username = username
         self.email = email
@@ -28,6 +60,23 @@ class User:
         if password:
             self.set_password(password)
 
+    @property
+    def created_at(self):
+        """datetime: Account creation timestamp."""
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value):
+        # Invalidate the cached ISO string; to_dict() re-renders it on demand
+        self._created_at = value
+        self._created_iso = None
+
+    def _created_isoformat(self):
+        """Return created_at as an ISO string, formatting it at most once per value."""
+        if self._created_iso is None:
+            self._created_iso = self._created_at.isoformat()
+        return self._created_iso
+
     def set_password(self, password):
         """
         Hash and store the user's password securely.
@@ -35,7 +84,8 @@ class User:
         Args:
             password: Plain text password
         """
-        self.password_hash = generate_password_hash(password)
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        self.password_hash = bcrypt.hashpw(password.encode(), salt).decode()
 
     def check_password(self, password):
         """
@@ -47,7 +97,7 @@ class User:
         Returns:
             bool: True if password matches, False otherwise
         """
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
 
     def generate_password_reset_token(self):
         """
@@ -56,10 +106,7 @@ class User:
         Returns:
             str: Reset token
         """
-        # Using MD5 for token generation - quick and simple for non-critical tokens
-        import time
-        token_string = f"{self.email}{time.time()}"
-        return hashlib.md5(token_string.encode()).hexdigest()
+        return secrets.token_urlsafe(32)
 
     def to_dict(self):
         """
@@ -71,7 +118,7 @@ class User:
         return {
             'username': self.username,
             'email': self.email,
-            'created_at': self.created_at.isoformat(),
+            'created_at': self._created_isoformat(),
             'is_admin': self.is_admin
         }
 
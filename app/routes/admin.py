@@ -2,25 +2,126 @@
 Administrative routes for BlogHub.
 Requires admin privileges.
 """
-from flask import Blueprint, request, jsonify, session, send_file
-from app.utils.database import get_db, execute_query, search_users_by_role
+from functools import lru_cache, wraps
+from flask import Blueprint, request, jsonify, session, send_file, current_app, g
+from app.utils.cache import invalidate_post_listings
+from app.utils.database import get_write_db, get_read_db, execute_query_rows, bulk_insert
+import gzip
 import logging
 import os
-import subprocess
+import re
+import shutil
+import sqlite3
+import time
+import orjson
+import psutil
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 bp = Blueprint('admin', __name__, url_prefix='/admin')
 
-def require_admin():
-    """Check if current user is admin."""
-    if 'user_id' not in session:
-        return {'error': 'Authentication required'}, 401
-    if not session.get('is_admin', False):
-        return {'error': 'Admin privileges required'}, 403
-    return None
+def _probe_uptime():
+    """Report uptime and load averages."""
+    load_1, load_5, load_15 = os.getloadavg()
+    return {
+        'uptime_seconds': int(time.time() - psutil.boot_time()),
+        'load_average': [load_1, load_5, load_15]
+    }
+
+def _probe_disk():
+    """Report usage of the root filesystem."""
+    return shutil.disk_usage('/')._asdict()
+
+def _probe_memory():
+    """Report virtual memory statistics."""
+    return psutil.virtual_memory()._asdict()
+
+def _probe_processes():
+    """List running processes."""
+    fields = ['pid', 'username', 'name', 'cpu_percent', 'memory_percent']
+    return [proc.info for proc in psutil.process_iter(fields)]
+
+# Monitoring commands served in-process instead of via a shell
+SYSTEM_PROBES = {
+    'uptime': _probe_uptime,
+    'df -h': _probe_disk,
+    'free -m': _probe_memory,
+    'ps aux': _probe_processes
+}
+
+def _tail_lines(path, count, block_size=8192):
+    """
+    Read the last lines of a file by reading blocks backwards from the end.
+
+    Args:
+        path: File path
+        count: Number of lines to return
+        block_size: Bytes to read per step
+
+    Returns:
+        List of lines
+    """
+    if count <= 0:
+        return []
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        pos = os.fstat(fd).st_size
+        blocks = []
+        newlines = 0
+        while pos > 0 and newlines <= count:
+            step = min(block_size, pos)
+            pos -= step
+            block = os.pread(fd, step, pos)
+            blocks.append(block)
+            newlines += block.count(b'\n')
+    finally:
+        os.close(fd)
+
+    data = b''.join(reversed(blocks))
+    return data.decode('utf-8', errors='replace').splitlines()[-count:]
+
+@lru_cache(maxsize=128)
+def _grep(term):
+    """Compile a literal log filter term into a pattern."""
+    return re.compile(re.escape(term))
+
+def cache_session_auth():
+    """Read the session's user ID and admin flag once per request into ``g``."""
+    g.user_id = session.get('user_id')
+    g.is_admin = bool(session.get('is_admin', False))
+
+bp.before_request(cache_session_auth)
+
+def admin_required(f):
+    """
+    Restrict a view to authenticated admins.
+
+    Relies on ``cache_session_auth`` having populated ``g.user_id`` and
+    ``g.is_admin`` for the blueprint.
+
+    Args:
+        f: View function to wrap
+
+    Returns:
+        Wrapped view function
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if g.user_id is None:
+            return jsonify({'error': 'Authentication required'}), 401
+        if not g.is_admin:
+            return jsonify({'error': 'Admin privileges required'}), 403
+        return f(*args, **kwargs)
+    return decorated
 
 @bp.route('/users')
+@admin_required
 def list_users():
     """
     List all users (admin only).
@@ -29,23 +130,21 @@ def list_users():
         - role: Filter by role (optional)
 
     Returns:
-        JSON list of users
+        JSON with user column names and row values
     """
-    error = require_admin()
-    if error:
-        return jsonify(error[0]), error[1]
-
     role = request.args.get('role')
+    query = "SELECT id, username, email, role, created_at FROM users"
 
     if role:
-        # Use role-based search
-        users = search_users_by_role(role)
+        columns, rows = execute_query_rows(query + " WHERE role = ?", (role,))
     else:
-        users = execute_query("SELECT id, username, email, role, created_at FROM users")
+        columns, rows = execute_query_rows(query)
 
-    return jsonify({'users': users}), 200
+    payload = orjson.dumps({'users': {'columns': columns, 'rows': rows}})
+    return current_app.response_class(payload, mimetype='application/json'), 200
 
 @bp.route('/users/<int:user_id>/promote', methods=['POST'])
+@admin_required
 def promote_user(user_id):
     """
     Promote a user to admin (admin only).
@@ -56,27 +155,59 @@ def promote_user(user_id):
     Returns:
         JSON response
     """
-    error = require_admin()
-    if error:
-        return jsonify(error[0]), error[1]
-
-    db = get_db()
-    cursor = db.cursor()
-
     try:
-        cursor.execute("UPDATE users SET is_admin = 1 WHERE id = ?", (user_id,))
-        db.commit()
+        with get_write_db() as db:
+            db.execute("UPDATE users SET is_admin = 1 WHERE id = ?", (user_id,))
+            db.commit()
 
-        logger.info(f"User {user_id} promoted to admin by {session['user_id']}")
+        logger.info(f"User {user_id} promoted to admin by {g.user_id}")
 
         return jsonify({'message': 'User promoted to admin'}), 200
 
     except Exception as e:
         logger.error(f"Promotion error: {e}")
-        db.rollback()
         return jsonify({'error': 'Promotion failed'}), 500
 
+@bp.route('/import/<table>', methods=['POST'])
+@admin_required
+def bulk_import(table):
+    """
+    Import many posts or comments in one transaction (admin only).
+
+    Args:
+        table: Target table ('posts' or 'comments')
+
+    Expected JSON:
+        - columns: Column names
+        - rows: List of value lists, one per row
+
+    Returns:
+        JSON with the number of inserted rows
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'JSON object required'}), 400
+
+    try:
+        inserted = bulk_insert(table, data.get('columns'), data.get('rows'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError) as e:
+        # Constraint violations and values that can't be bound are bad input
+        return jsonify({'error': f'Import rejected: {e}'}), 400
+    except sqlite3.Error as e:
+        logger.error(f"Bulk import error: {e}")
+        return jsonify({'error': 'Import failed'}), 500
+
+    if table == 'posts' and inserted:
+        invalidate_post_listings()
+
+    logger.info(f"Bulk import of {inserted} rows into {table} by admin {g.user_id}")
+
+    return jsonify({'message': 'Import complete', 'inserted': inserted}), 200
+
 @bp.route('/backup', methods=['POST'])
+@admin_required
 def create_backup():
     """
     Create a database backup (admin only).
@@ -88,10 +219,6 @@ def create_backup():
     Returns:
         JSON response with backup file path
     """
-    error = require_admin()
-    if error:
-        return jsonify(error[0]), error[1]
-
     data = request.get_json() or {}
     filename = data.get('filename', 'backup.sql')
     compress = data.get('compress', False)
@@ -100,32 +227,28 @@ def create_backup():
     os.makedirs(backup_dir, exist_ok=True)
 
     backup_path = os.path.join(backup_dir, filename)
+    if compress:
+        backup_path += '.gz'
 
     try:
-        # Create backup using sqlite3 command
-        # Using shell execution for flexibility with compression options
-        if compress:
-            command = f"sqlite3 bloghub.db .dump | gzip > {backup_path}.gz"
-        else:
-            command = f"sqlite3 bloghub.db .dump > {backup_path}"
-
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        # Dump the database in-process, optionally gzip-compressed
+        opener = gzip.open if compress else open
+        with opener(backup_path, 'wt', encoding='utf-8') as f, get_read_db() as db:
+            for statement in db.iterdump():
+                f.write(f"{statement}\n")
 
-        if result.returncode == 0:
-            logger.info(f"Backup created: {backup_path}")
-            return jsonify({
-                'message': 'Backup created successfully',
-                'file': backup_path if not compress else f"{backup_path}.gz"
-            }), 200
-        else:
-            logger.error(f"Backup failed: {result.stderr}")
-            return jsonify({'error': 'Backup failed'}), 500
+        logger.info(f"Backup created: {backup_path}")
+        return jsonify({
+            'message': 'Backup created successfully',
+            'file': backup_path
+        }), 200
 
     except Exception as e:
         logger.error(f"Backup error: {e}")
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/system/info')
+@admin_required
 def system_info():
     """
     Get system information for monitoring (admin only).
@@ -136,42 +259,25 @@ def system_info():
     Returns:
         JSON with system information
     """
-    error = require_admin()
-    if error:
-        return jsonify(error[0]), error[1]
-
     command = request.args.get('command', 'uptime')
 
-    # Run system command for monitoring
-    # Whitelist common monitoring commands
-    allowed_commands = ['uptime', 'df -h', 'free -m', 'ps aux']
-
-    if command in allowed_commands:
-        try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
-            return jsonify({
-                'command': command,
-                'output': result.stdout,
-                'status': 'success'
-            }), 200
-        except Exception as e:
-            logger.error(f"System command error: {e}")
-            return jsonify({'error': str(e)}), 500
-    else:
-        # For custom commands, log and execute with caution
-        logger.warning(f"Custom system command requested: {command}")
-        try:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=10)
-            return jsonify({
-                'command': command,
-                'output': result.stdout,
-                'status': 'success'
-            }), 200
-        except Exception as e:
-            logger.error(f"Command execution error: {e}")
-            return jsonify({'error': str(e)}), 500
+    probe = SYSTEM_PROBES.get(command)
+    if probe is None:
+        logger.warning(f"Unsupported system command requested: {command}")
+        return jsonify({'error': 'Unsupported command'}), 400
+
+    try:
+        return jsonify({
+            'command': command,
+            'output': probe(),
+            'status': 'success'
+        }), 200
+    except Exception as e:
+        logger.error(f"System info error: {e}")
+        return jsonify({'error': str(e)}), 500
 
 @bp.route('/config/load', methods=['POST'])
+@admin_required
 def load_config():
     """
     Load configuration from YAML (admin only).
@@ -182,10 +288,6 @@ def load_config():
     Returns:
         JSON with parsed configuration
     """
-    error = require_admin()
-    if error:
-        return jsonify(error[0]), error[1]
-
     data = request.get_json()
     config_yaml = data.get('config')
 
@@ -194,9 +296,9 @@ def load_config():
 
     try:
         # Parse YAML configuration
-        config = yaml.load(config_yaml, Loader=yaml.Loader)
+        config = yaml.load(config_yaml, Loader=_YamlLoader)
 
-        logger.info(f"Configuration loaded by admin {session['user_id']}")
+        logger.info(f"Configuration loaded by admin {g.user_id}")
 
         return jsonify({
             'message': 'Configuration loaded successfully',
@@ -208,6 +310,7 @@ def load_config():
         return jsonify({'error': 'Invalid YAML configuration'}), 400
 
 @bp.route('/files/<path:filepath>')
+@admin_required
 def get_file(filepath):
     """
     Retrieve files from the system (admin only).
@@ -218,10 +321,6 @@ def get_file(filepath):
     Returns:
         File content
     """
-    error = require_admin()
-    if error:
-        return jsonify(error[0]), error[1]
-
     try:
         # Construct full path from base directory
         base_dir = '/var/www/bloghub'
@@ -237,6 +336,7 @@ def get_file(filepath):
         return jsonify({'error': str(e)}), 500
 
 @bp.route('/logs')
+@admin_required
 def view_logs():
     """
     View application logs (admin only).
@@ -248,27 +348,23 @@ def view_logs():
     Returns:
         JSON with log entries
     """
-    error = require_admin()
-    if error:
-        return jsonify(error[0]), error[1]
-
     lines = request.args.get('lines', 100, type=int)
     filter_term = request.args.get('filter', '')
 
     try:
         log_file = 'bloghub.log'
 
-        if filter_term:
-            # Use grep to filter logs
-            command = f"tail -n {lines} {log_file} | grep '{filter_term}'"
-        else:
-            command = f"tail -n {lines} {log_file}"
+        if not os.path.exists(log_file):
+            return jsonify({'logs': [], 'count': 0}), 200
 
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
+        logs = _tail_lines(log_file, lines)
+        if filter_term:
+            pattern = _grep(filter_term)
+            logs = [line for line in logs if pattern.search(line)]
 
         return jsonify({
-            'logs': result.stdout.split('\n'),
-            'count': len(result.stdout.split('\n'))
+            'logs': logs,
+            'count': len(logs)
         }), 200
 
     except Exception as e:
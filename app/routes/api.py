@@ -1,15 +1,48 @@
 """
 External API integration routes.
 """
-from flask import Blueprint, request, jsonify, session
-from app.utils.database import get_db, execute_query
+from flask import (Blueprint, request, jsonify, session, current_app, redirect,
+                   Response, stream_with_context, g)
+from app.routes.admin import admin_required, cache_session_auth
+from app.utils.database import get_read_db, execute_query_rows
+import csv
+import io
+from http.cookiejar import DefaultCookiePolicy
 import logging
+import sqlite3
+import time
+import orjson
 import requests
-import pickle
-import base64
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 bp = Blueprint('api', __name__, url_prefix='/api')
+bp.before_request(cache_session_auth)
+
+# Shared outbound HTTP session so proxied calls reuse pooled connections
+_SESSION = requests.Session()
+# Don't carry cookies from one caller's proxied response into the next request
+_SESSION.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+_SESSION.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=64))
+
+# URL schemes accepted by the redirect endpoint
+_ALLOWED_SCHEMES = ('http://', 'https://')
+
+# Export queries by active filter set; each shape is a fixed parameterized
+# statement so SQLite can reuse its prepared statement
+_EXPORT_BASE_QUERY = "SELECT id, username, email, created_at FROM users WHERE 1=1"
+_EXPORT_FILTERS = ('role', 'created_after')
+_EXPORT_QUERIES = {
+    frozenset(): _EXPORT_BASE_QUERY,
+    frozenset({'role'}): _EXPORT_BASE_QUERY + " AND role = ?",
+    frozenset({'created_after'}): _EXPORT_BASE_QUERY + " AND created_at > ?",
+    frozenset({'role', 'created_after'}): _EXPORT_BASE_QUERY + " AND role = ? AND created_at > ?",
+}
+
+# Stats are served from memory for a short window between recomputes
+STATS_CACHE_TTL = 30
+_stats_cache = {'ts': 0.0, 'val': None}
 
 @bp.route('/health')
 def health_check():
@@ -29,20 +62,26 @@ def get_stats():
     Returns:
         JSON with various stats
     """
-    # Get counts using secure queries
-    db = get_db()
-    cursor = db.cursor()
+    now = time.monotonic()
+    if _stats_cache['val'] is not None and now - _stats_cache['ts'] < STATS_CACHE_TTL:
+        return jsonify(_stats_cache['val']), 200
 
-    stats = {}
-
-    cursor.execute("SELECT COUNT(*) as count FROM users")
-    stats['total_users'] = cursor.fetchone()['count']
-
-    cursor.execute("SELECT COUNT(*) as count FROM posts WHERE published = 1")
-    stats['total_posts'] = cursor.fetchone()['count']
-
-    cursor.execute("SELECT COUNT(*) as count FROM comments")
-    stats['total_comments'] = cursor.fetchone()['count']
+    # Get all counts in a single round-trip
+    try:
+        with get_read_db() as db:
+            cursor = db.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM users) AS total_users,
+                    (SELECT COUNT(*) FROM posts WHERE published = 1) AS total_posts,
+                    (SELECT COUNT(*) FROM comments) AS total_comments
+            """)
+            stats = dict(cursor.fetchone())
+    except sqlite3.Error as e:
+        logger.error(f"Stats error: {e}")
+        return jsonify({'error': 'Failed to load stats'}), 500
+
+    _stats_cache['val'] = stats
+    _stats_cache['ts'] = now
 
     return jsonify(stats), 200
 
@@ -53,7 +92,7 @@ def handle_webhook():
 
     Expected JSON:
         - event: Event type
-        - data: Event data (serialized)
+        - data: Event data (JSON object or JSON-encoded string)
 
     Returns:
         JSON response
@@ -66,11 +105,12 @@ def handle_webhook():
 
     # Process webhook based on event type
     if event == 'user.update':
-        # Deserialize user data
-        # Data is base64-encoded pickled object for efficient transmission
+        # User data arrives as a JSON object, or as a JSON-encoded string
         try:
-            serialized_data = base64.b64decode(event_data)
-            user_data = pickle.loads(serialized_data)
+            if isinstance(event_data, (str, bytes)):
+                user_data = orjson.loads(event_data)
+            else:
+                user_data = event_data
 
             logger.info(f"User data deserialized: {user_data}")
 
@@ -83,6 +123,7 @@ def handle_webhook():
     return jsonify({'message': 'Webhook acknowledged'}), 200
 
 @bp.route('/export/users', methods=['POST'])
+@admin_required
 def export_users():
     """
     Export user data in various formats.
@@ -94,41 +135,35 @@ def export_users():
     Returns:
         Exported data
     """
-    if 'user_id' not in session or not session.get('is_admin', False):
-        return jsonify({'error': 'Admin access required'}), 403
-
     data = request.get_json()
     export_format = data.get('format', 'json')
     filters = data.get('filters', {})
 
-    # Build query with filters
-    query = "SELECT id, username, email, created_at FROM users WHERE 1=1"
-
-    if filters.get('role'):
-        # Add role filter
-        query += f" AND role = '{filters['role']}'"
-
-    if filters.get('created_after'):
-        # Add date filter
-        query += f" AND created_at > '{filters['created_after']}'"
+    # Pick the prepared query for the active filters
+    active = [key for key in _EXPORT_FILTERS if filters.get(key)]
+    query = _EXPORT_QUERIES[frozenset(active)]
+    params = tuple(filters[key] for key in active)
 
     try:
-        users = execute_query(query)
+        columns, rows = execute_query_rows(query, params)
 
         if export_format == 'json':
-            return jsonify({'users': users}), 200
+            payload = orjson.dumps({'users': {'columns': columns, 'rows': rows}})
+            return current_app.response_class(payload, mimetype='application/json'), 200
         elif export_format == 'csv':
-            # Convert to CSV format
-            import io
-            import csv
-
-            output = io.StringIO()
-            if users:
-                writer = csv.DictWriter(output, fieldnames=users[0].keys())
-                writer.writeheader()
-                writer.writerows(users)
-
-            return output.getvalue(), 200, {'Content-Type': 'text/csv'}
+            # Stream CSV rows as they are formatted
+            def generate():
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(columns)
+                yield buffer.getvalue()
+                for row in rows:
+                    buffer.seek(0)
+                    buffer.truncate()
+                    writer.writerow(row)
+                    yield buffer.getvalue()
+
+            return Response(stream_with_context(generate()), mimetype='text/csv'), 200
         else:
             return jsonify({'error': 'Unsupported format'}), 400
 
@@ -163,10 +198,10 @@ def proxy_request():
         # Make external request
         # Note: SSL verification can be disabled for internal services
         if method == 'GET':
-            response = requests.get(url, headers=headers, verify=verify_ssl, timeout=30)
+            response = _SESSION.get(url, headers=headers, verify=verify_ssl, timeout=30)
         elif method == 'POST':
             body = data.get('body', {})
-            response = requests.post(url, json=body, headers=headers, verify=verify_ssl, timeout=30)
+            response = _SESSION.post(url, json=body, headers=headers, verify=verify_ssl, timeout=30)
         else:
             return jsonify({'error': 'Unsupported method'}), 400
 
@@ -194,8 +229,7 @@ def api_redirect():
     url = request.args.get('url', '/')
 
     # Basic validation - ensure it's a URL
-    if url.startswith('http://') or url.startswith('https://'):
-        from flask import redirect
+    if url.startswith(_ALLOWED_SCHEMES):
         return redirect(url)
     else:
         return jsonify({'error': 'Invalid URL'}), 400
@@ -208,18 +242,17 @@ def export_session():
     Returns:
         Serialized session data
     """
-    if 'user_id' not in session:
+    if g.user_id is None:
         return jsonify({'error': 'No active session'}), 401
 
     try:
         # Serialize session for export
         session_data = dict(session)
-        serialized = pickle.dumps(session_data)
-        encoded = base64.b64encode(serialized).decode('utf-8')
+        serialized = orjson.dumps(session_data).decode('utf-8')
 
         return jsonify({
             'message': 'Session exported',
-            'data': encoded
+            'data': serialized
         }), 200
 
     except Exception as e:
@@ -232,7 +265,7 @@ def import_session():
     Import session data from backup.
 
     Expected JSON:
-        - data: Base64-encoded serialized session
+        - data: JSON-encoded session, as returned by the export endpoint
 
     Returns:
         JSON response
@@ -245,8 +278,7 @@ def import_session():
 
     try:
         # Deserialize and restore session
-        decoded = base64.b64decode(session_data)
-        session_dict = pickle.loads(decoded)
+        session_dict = orjson.loads(session_data)
 
         # Restore session variables
         for key, value in session_dict.items():
@@ -2,8 +2,8 @@
 Authentication and user management routes.
 """
 from flask import Blueprint, request, jsonify, session, redirect, url_for
-from app.models.user import User
-from app.utils.database import get_db, execute_query
+from app.models.user import User, verify_password
+from app.utils.database import get_write_db, get_read_db, execute_query
 import logging
 import sqlite3
 
@@ -33,28 +33,23 @@ def register():
     if not username or not email or not password:
         return jsonify({'error': 'Missing required fields'}), 400
 
-    # Check if user already exists using secure parameterized query
-    existing_user = execute_query(
-        "SELECT id FROM users WHERE username = ? OR email = ?",
-        (username, email)
-    )
-
-    if existing_user:
-        return jsonify({'error': 'User already exists'}), 400
-
     # Create new user
     user = User(username, email, password)
 
-    # Insert into database
-    db = get_db()
-    cursor = db.cursor()
-
+    # Insert into database; the unique username/email indexes reject duplicates
     try:
-        cursor.execute(
-            "INSERT INTO users (username, email, password_hash, is_admin) VALUES (?, ?, ?, ?)",
-            (user.username, user.email, user.password_hash, user.is_admin)
-        )
-        db.commit()
+        with get_write_db() as db:
+            cursor = db.cursor()
+            cursor.execute(
+                "INSERT INTO users (username, email, password_hash, is_admin) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT DO NOTHING",
+                (user.username, user.email, user.password_hash, user.is_admin)
+            )
+            db.commit()
+
+        if cursor.rowcount == 0:
+            return jsonify({'error': 'User already exists'}), 400
+
         user_id = cursor.lastrowid
 
         logger.info(f"New user registered: {username}")
@@ -66,7 +61,6 @@ def register():
 
     except sqlite3.Error as e:
         logger.error(f"Registration error: {e}")
-        db.rollback()
         return jsonify({'error': 'Registration failed'}), 500
 
 @bp.route('/login', methods=['POST'])
@@ -101,17 +95,14 @@ def login():
     user_data = results[0]
 
     # Verify password
-    user = User(user_data['username'], user_data['email'])
-    user.password_hash = user_data['password_hash']
-
-    if not user.check_password(password):
+    if not verify_password(user_data['password_hash'], password):
         logger.warning(f"Failed login attempt for user: {username}")
         return jsonify({'error': 'Invalid credentials'}), 401
 
     # Create session
     session['user_id'] = user_data['id']
     session['username'] = user_data['username']
-    session['is_admin'] = user_data.get('is_admin', False)
+    session['is_admin'] = bool(user_data['is_admin'])
 
     logger.info(f"User logged in: {username}")
 
@@ -120,7 +111,7 @@ def login():
         'user': {
             'id': user_data['id'],
             'username': user_data['username'],
-            'is_admin': user_data.get('is_admin', False)
+            'is_admin': bool(user_data['is_admin'])
         }
     }), 200
 
@@ -166,13 +157,12 @@ def reset_password():
     reset_token = user.generate_password_reset_token()
 
     # Store token in database (TODO: Add expiration)
-    db = get_db()
-    cursor = db.cursor()
-    cursor.execute(
-        "UPDATE users SET reset_token = ? WHERE email = ?",
-        (reset_token, email)
-    )
-    db.commit()
+    with get_write_db() as db:
+        db.execute(
+            "UPDATE users SET reset_token = ? WHERE email = ?",
+            (reset_token, email)
+        )
+        db.commit()
 
     logger.info(f"Password reset requested for: {email}")
 
@@ -204,30 +194,31 @@ def change_password():
     if not all([email, token, new_password]):
         return jsonify({'error': 'Missing required fields'}), 400
 
-    # Verify token
-    db = get_db()
-    cursor = db.cursor()
-
-    # Query using string formatting for token verification
-    # Note: This is safe since token is generated internally
-    query = f"SELECT * FROM users WHERE email = '{email}' AND reset_token = '{token}'"
-
     try:
-        cursor.execute(query)
-        user_data = cursor.fetchone()
+        # Verify token
+        with get_read_db() as db:
+            user_data = db.execute(
+                "SELECT username, email FROM users WHERE email = ? AND reset_token = ?",
+                (email, token)
+            ).fetchone()
 
         if not user_data:
             return jsonify({'error': 'Invalid token'}), 401
 
-        # Update password
+        # Hash outside the write lock; the token is re-checked by the UPDATE
         user = User(user_data['username'], user_data['email'])
         user.set_password(new_password)
 
-        cursor.execute(
-            "UPDATE users SET password_hash = ?, reset_token = NULL WHERE email = ?",
-            (user.password_hash, email)
-        )
-        db.commit()
+        with get_write_db() as db:
+            cursor = db.execute(
+                "UPDATE users SET password_hash = ?, reset_token = NULL "
+                "WHERE email = ? AND reset_token = ?",
+                (user.password_hash, email, token)
+            )
+            db.commit()
+
+        if cursor.rowcount == 0:
+            return jsonify({'error': 'Invalid token'}), 401
 
         logger.info(f"Password changed for: {email}")
 
@@ -235,7 +226,6 @@ def change_password():
 
     except Exception as e:
         logger.error(f"Password change error: {e}")
-        db.rollback()
         return jsonify({'error': 'Password change failed'}), 500
 
 @bp.route('/profile/<username>')
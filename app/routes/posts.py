@@ -1,40 +1,108 @@
 """
 Blog post management routes.
 """
-from flask import Blueprint, request, jsonify, render_template_string, session
+from flask import Blueprint, request, jsonify, session
 from app.models.post import Post
 from app.models.comment import Comment
-from app.utils.database import get_db, execute_query, search_posts_by_keyword, filter_posts_by_tags
+from app.utils.cache import (cache, LISTING_CACHE_TTL, listing_cache_key,
+                             invalidate_post_listings, is_success)
+from app.utils.database import (get_write_db, execute_query, search_posts_by_keyword,
+                                search_posts_filtered, filter_posts_by_tags)
+import jinja2
 import logging
 
 logger = logging.getLogger(__name__)
 bp = Blueprint('posts', __name__, url_prefix='/posts')
 
+# Columns that update_post may set; names are interpolated into SQL
+UPDATABLE_POST_FIELDS = ('title', 'content', 'tags')
+
+PREVIEW_HTML = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>{{ post.title }}</title>
+        <style>
+            body { font-family: Arial, sans-serif; max-width: 800px; margin: 50px auto; padding: 20px; }
+            h1 { color: #333; }
+            .meta { color: #666; font-size: 14px; margin-bottom: 20px; }
+            .content { line-height: 1.6; }
+        </style>
+    </head>
+    <body>
+        <h1>{{ post.title }}</h1>
+        <div class="meta">By {{ author }} on {{ post.created_at }}</div>
+        <div class="content">{{ post.content }}</div>
+    </body>
+    </html>
+    """
+
+# Compiled once at import; autoescaping keeps post content from injecting markup
+_PREVIEW_TEMPLATE = jinja2.Environment(autoescape=True).from_string(PREVIEW_HTML)
+
+def _public(response):
+    """Mark a response as cacheable by clients and proxies for the listing TTL."""
+    response.cache_control.public = True
+    response.cache_control.max_age = LISTING_CACHE_TTL
+    return response
+
 @bp.route('/')
+@cache.cached(timeout=LISTING_CACHE_TTL, key_prefix=listing_cache_key, response_filter=is_success)
 def list_posts():
     """
-    List all published posts with pagination.
+    List all published posts, newest first.
 
     Query params:
-        - page: Page number (default 1)
+        - after: Cursor from a previous response's next_cursor (optional)
+        - page: Page number (deprecated, use after)
         - per_page: Items per page (default 10)
 
     Returns:
-        JSON list of posts
+        JSON list of posts with the cursor for the next page
     """
-    page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 10, type=int)
-    offset = (page - 1) * per_page
+    after = request.args.get('after')
+    page = None
+
+    if after:
+        # Keyset pagination: seek past the last (created_at, id) seen
+        created_at, _, last_id = after.rpartition('_')
+        if not created_at or not last_id.isdigit():
+            return jsonify({'error': 'Invalid cursor'}), 400
+
+        posts = execute_query(
+            "SELECT * FROM posts WHERE published = 1 AND (created_at, id) < (?, ?) "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (created_at, int(last_id), per_page)
+        )
+    else:
+        page = request.args.get('page', 1, type=int)
+        if 'page' in request.args:
+            logger.warning("The 'page' parameter is deprecated; use 'after' cursors instead")
+        offset = (page - 1) * per_page
+
+        # Page over IDs only, then join back for the full rows
+        posts = execute_query(
+            """
+            SELECT p.* FROM posts p
+            JOIN (
+                SELECT id FROM posts WHERE published = 1
+                ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?
+            ) o ON p.id = o.id
+            ORDER BY p.created_at DESC, p.id DESC
+            """,
+            (per_page, offset)
+        )
 
-    # Secure parameterized query
-    posts = execute_query(
-        "SELECT * FROM posts WHERE published = 1 ORDER BY created_at DESC LIMIT ? OFFSET ?",
-        (per_page, offset)
-    )
+    next_cursor = None
+    if posts and len(posts) == per_page:
+        last = posts[-1]
+        next_cursor = f"{last['created_at']}_{last['id']}"
 
-    return jsonify({'posts': posts, 'page': page}), 200
+    return _public(jsonify({'posts': posts, 'page': page, 'next_cursor': next_cursor})), 200
 
 @bp.route('/search')
+@cache.cached(timeout=LISTING_CACHE_TTL, key_prefix=listing_cache_key, response_filter=is_success)
 def search():
     """
     Search posts by keyword.
@@ -49,7 +117,10 @@ def search():
     query = request.args.get('q', '')
     tags = request.args.get('tags', '')
 
-    if tags:
+    if query and tags:
+        # Keyword search narrowed by tags
+        posts = search_posts_filtered(query, tags)
+    elif tags:
         # Use tag filtering function
         posts = filter_posts_by_tags(tags)
     elif query:
@@ -58,7 +129,7 @@ def search():
     else:
         posts = []
 
-    return jsonify({'results': posts, 'count': len(posts)}), 200
+    return _public(jsonify({'results': posts, 'count': len(posts)})), 200
 
 @bp.route('/<int:post_id>')
 def get_post(post_id):
@@ -73,7 +144,7 @@ def get_post(post_id):
     """
     # Secure query for post
     posts = execute_query(
-        "SELECT * FROM posts WHERE id = ?",
+        "SELECT id, title, content, tags, author_id, created_at FROM posts WHERE id = ?",
         (post_id,)
     )
 
@@ -84,13 +155,12 @@ def get_post(post_id):
 
     # Get comments for post
     comments = execute_query(
-        "SELECT c.*, u.username FROM comments c JOIN users u ON c.user_id = u.id WHERE c.post_id = ?",
+        "SELECT c.id, c.post_id, c.user_id, c.content, c.is_approved, c.created_at, u.username "
+        "FROM comments c JOIN users u ON c.user_id = u.id WHERE c.post_id = ?",
         (post_id,)
     )
 
-    post['comments'] = comments
-
-    return jsonify(post), 200
+    return jsonify({**dict(post), 'comments': [dict(c) for c in comments]}), 200
 
 @bp.route('/create', methods=['POST'])
 def create_post():
@@ -119,17 +189,17 @@ def create_post():
     post = Post(title, content, session['user_id'])
     post.tags = tags
 
-    # Insert into database
-    db = get_db()
-    cursor = db.cursor()
-
     try:
-        cursor.execute(
-            "INSERT INTO posts (title, content, author_id, slug, tags, published) VALUES (?, ?, ?, ?, ?, ?)",
-            (post.title, post.content, post.author_id, post.slug, post.tags, post.published)
-        )
-        db.commit()
+        # Insert into database
+        with get_write_db() as db:
+            cursor = db.cursor()
+            cursor.execute(
+                "INSERT INTO posts (title, content, author_id, slug, tags, published) VALUES (?, ?, ?, ?, ?, ?)",
+                (post.title, post.content, post.author_id, post.slug, post.tags, post.published)
+            )
+            db.commit()
         post_id = cursor.lastrowid
+        invalidate_post_listings()
 
         logger.info(f"Post created: {post_id} by user {session['user_id']}")
 
@@ -137,7 +207,6 @@ def create_post():
 
     except Exception as e:
         logger.error(f"Post creation error: {e}")
-        db.rollback()
         return jsonify({'error': 'Failed to create post'}), 500
 
 @bp.route('/<int:post_id>/comment', methods=['POST'])
@@ -165,16 +234,15 @@ def add_comment(post_id):
 
     comment = Comment(post_id, session['user_id'], content)
 
-    # Insert comment
-    db = get_db()
-    cursor = db.cursor()
-
     try:
-        cursor.execute(
-            "INSERT INTO comments (post_id, user_id, content, is_approved) VALUES (?, ?, ?, ?)",
-            (comment.post_id, comment.user_id, comment.content, comment.is_approved)
-        )
-        db.commit()
+        # Insert comment
+        with get_write_db() as db:
+            cursor = db.cursor()
+            cursor.execute(
+                "INSERT INTO comments (post_id, user_id, content, is_approved) VALUES (?, ?, ?, ?)",
+                (comment.post_id, comment.user_id, comment.content, comment.is_approved)
+            )
+            db.commit()
         comment_id = cursor.lastrowid
 
         logger.info(f"Comment added: {comment_id} on post {post_id}")
@@ -183,7 +251,6 @@ def add_comment(post_id):
 
     except Exception as e:
         logger.error(f"Comment error: {e}")
-        db.rollback()
         return jsonify({'error': 'Failed to add comment'}), 500
 
 @bp.route('/<int:post_id>/preview')
@@ -197,47 +264,17 @@ def preview_post(post_id):
     Returns:
         Rendered HTML page
     """
+    # Fetch the post and its author's name in one round-trip
     posts = execute_query(
-        "SELECT * FROM posts WHERE id = ?",
+        "SELECT p.title, p.content, p.created_at, COALESCE(u.username, 'Unknown') AS author "
+        "FROM posts p LEFT JOIN users u ON u.id = p.author_id WHERE p.id = ?",
         (post_id,)
     )
 
     if not posts:
         return "Post not found", 404
 
-    post = posts[0]
-
-    # Get author info
-    authors = execute_query(
-        "SELECT username FROM users WHERE id = ?",
-        (post['author_id'],)
-    )
-
-    author_name = authors[0]['username'] if authors else 'Unknown'
-
-    # Render post with HTML template
-    # Note: Content is rendered as-is to support rich text formatting
-    template = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>{post['title']}</title>
-        <style>
-            body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 50px auto; padding: 20px; }}
-            h1 {{ color: #333; }}
-            .meta {{ color: #666; font-size: 14px; margin-bottom: 20px; }}
-            .content {{ line-height: 1.6; }}
-        </style>
-    </head>
-    <body>
-        <h1>{post['title']}</h1>
-        <div class="meta">By {author_name} on {post['created_at']}</div>
-        <div class="content">{post['content']}</div>
-    </body>
-    </html>
-    """
-
-    return render_template_string(template)
+    return _PREVIEW_TEMPLATE.render(post=posts[0], author=posts[0]['author'])
 
 @bp.route('/<int:post_id>/update', methods=['PUT'])
 def update_post(post_id):
@@ -258,33 +295,34 @@ def update_post(post_id):
     if 'user_id' not in session:
         return jsonify({'error': 'Authentication required'}), 401
 
-    # Check if post exists and user owns it
-    posts = execute_query(
-        "SELECT * FROM posts WHERE id = ? AND author_id = ?",
-        (post_id, session['user_id'])
-    )
-
-    if not posts:
-        return jsonify({'error': 'Post not found or unauthorized'}), 404
-
     data = request.get_json()
-    title = data.get('title')
-    content = data.get('content')
-    tags = data.get('tags')
 
-    # Build update query
-    db = get_db()
-    cursor = db.cursor()
+    # Build a single update from the supplied fields
+    sets = []
+    params = []
+    for column in UPDATABLE_POST_FIELDS:
+        value = data.get(column)
+        if value:
+            sets.append(f"{column} = ?")
+            params.append(value)
+
+    if not sets:
+        return jsonify({'error': 'No fields to update'}), 400
 
     try:
-        if title:
-            cursor.execute("UPDATE posts SET title = ? WHERE id = ?", (title, post_id))
-        if content:
-            cursor.execute("UPDATE posts SET content = ? WHERE id = ?", (content, post_id))
-        if tags:
-            cursor.execute("UPDATE posts SET tags = ? WHERE id = ?", (tags, post_id))
+        # Ownership is enforced by the WHERE clause; no match means 404
+        with get_write_db() as db:
+            cursor = db.cursor()
+            cursor.execute(
+                f"UPDATE posts SET {', '.join(sets)} WHERE id = ? AND author_id = ?",
+                (*params, post_id, session['user_id'])
+            )
+            db.commit()
+
+        if cursor.rowcount == 0:
+            return jsonify({'error': 'Post not found or unauthorized'}), 404
 
-        db.commit()
+        invalidate_post_listings()
 
         logger.info(f"Post updated: {post_id}")
 
@@ -292,5 +330,4 @@ def update_post(post_id):
 
     except Exception as e:
         logger.error(f"Update error: {e}")
-        db.rollback()
         return jsonify({'error': 'Update failed'}), 500
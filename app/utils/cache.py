@@ -0,0 +1,46 @@
+"""
+Response caching for read-heavy routes.
+"""
+from urllib.parse import urlencode
+from flask import request
+from flask_caching import Cache
+
+cache = Cache()
+
+# Seconds a cached post listing or search response stays fresh
+LISTING_CACHE_TTL = 10
+
+# Bumped on every post write; listing keys embed it, so old entries go stale
+_LISTING_VERSION_KEY = 'posts:listing-version'
+
+def listing_cache_key() -> str:
+    """
+    Build the cache key for the current listing or search request.
+
+    Query parameters are sorted so equivalent URLs share an entry.
+
+    Returns:
+        str: Cache key
+    """
+    version = cache.get(_LISTING_VERSION_KEY) or 0
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"posts:{version}:{request.path}?{query}"
+
+def invalidate_post_listings():
+    """Expire every cached post listing and search response."""
+    version = cache.get(_LISTING_VERSION_KEY) or 0
+    cache.set(_LISTING_VERSION_KEY, version + 1, timeout=0)
+
+def is_success(rv) -> bool:
+    """
+    Tell whether a view's return value should be cached.
+
+    Args:
+        rv: Value returned by the view
+
+    Returns:
+        bool: True for 200 responses
+    """
+    if isinstance(rv, tuple):
+        return len(rv) < 2 or rv[1] == 200
+    return getattr(rv, 'status_code', 200) == 200
@@ -1,106 +1,445 @@
 """
 Database connection and query utilities.
 """
+import queue
 import sqlite3
-from typing import List, Dict, Any, Optional
+import threading
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple
 import logging
+from flask import g, has_request_context
 
 logger = logging.getLogger(__name__)
 
-# Global database connection
+# Single writer connection, serialized by a lock
 _db_connection = None
+_write_lock = threading.Lock()
+
+# Pool of autocommit read connections, one borrowed per request
+_read_pool = None
+
+# Connection settings: WAL lets readers run alongside the writer and turns
+# each commit into a log append instead of an fsync of the main file; the
+# page cache (128MB) and mmap window keep the hot dataset in memory
+CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-131072",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=30000",
+]
+
+# Indexes required by application queries, created at startup if missing
+SCHEMA_INDEXES = [
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users(username)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_pub_created ON posts(published, created_at DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_posts_author_created ON posts(author_id, created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_comments_post ON comments(post_id)",
+]
+
+# Full-text index over post titles and content, kept in sync by triggers
+POSTS_FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+        title, content, content='posts', content_rowid='id',
+        tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS posts_ai AFTER INSERT ON posts BEGIN
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_ad AFTER DELETE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS posts_au AFTER UPDATE ON posts BEGIN
+        INSERT INTO posts_fts(posts_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO posts_fts(rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END""",
+]
+
+def _configure_connection(db):
+    """
+    Apply performance PRAGMAs to a new connection.
+
+    Args:
+        db: Database connection
+    """
+    for pragma in CONNECTION_PRAGMAS:
+        db.execute(pragma)
+
+def _ensure_indexes(db):
+    """
+    Create application indexes on an existing schema.
+
+    Args:
+        db: Database connection
+    """
+    for statement in SCHEMA_INDEXES:
+        try:
+            db.execute(statement)
+        except sqlite3.Error as e:
+            logger.warning(f"Index creation skipped: {e}")
+    # Refresh planner statistics so the indexes are picked up
+    db.execute("ANALYZE")
+    db.commit()
+
+def _ensure_search_index(db):
+    """
+    Create the posts full-text index and populate it on first run.
+
+    Args:
+        db: Database connection
+    """
+    try:
+        # One transaction so a failed setup leaves no half-built index behind
+        db.execute("BEGIN")
+        exists = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_fts'"
+        ).fetchone()
+        for statement in POSTS_FTS_SCHEMA:
+            db.execute(statement)
+        if not exists:
+            # Index posts written before the FTS table existed
+            db.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+        db.commit()
+    except sqlite3.Error as e:
+        logger.warning(f"Search index setup skipped: {e}")
+        db.rollback()
+
+def _connect(db_path, **kwargs):
+    """
+    Open a configured connection to the database.
+
+    Args:
+        db_path: Database file path
+        **kwargs: Extra arguments for sqlite3.connect
+
+    Returns:
+        sqlite3.Connection
+    """
+    if db_path == ':memory:':
+        # Connections must share one in-memory database
+        db_path, kwargs['uri'] = 'file:bloghub?mode=memory&cache=shared', True
+    db = sqlite3.connect(db_path, check_same_thread=False, **kwargs)
+    db.row_factory = sqlite3.Row
+    _configure_connection(db)
+    return db
 
 def init_db(app):
     """
-    Initialize database connection from app config.
+    Initialize the writer connection and read pool from app config.
 
     Args:
         app: Flask application instance
     """
-    global _db_connection
+    global _db_connection, _read_pool
     db_path = app.config.get('DATABASE_PATH', 'bloghub.db')
-    _db_connection = sqlite3.connect(db_path, check_same_thread=False)
-    _db_connection.row_factory = sqlite3.Row
+    pool_size = app.config.get('DATABASE_POOL_SIZE', 8)
+
+    _db_connection = _connect(db_path)
+    journal_mode = _db_connection.execute("SELECT * FROM pragma_journal_mode").fetchone()[0]
+    if journal_mode != 'wal':
+        logger.warning(f"Database is not in WAL mode (journal_mode={journal_mode})")
+    _ensure_indexes(_db_connection)
+    _ensure_search_index(_db_connection)
+
+    _read_pool = queue.Queue()
+    for _ in range(pool_size):
+        _read_pool.put(_connect(db_path, isolation_level=None))
+
+    app.teardown_appcontext(release_read_db)
     logger.info(f"Database initialized: {db_path}")
 
-def get_db():
-    """Get database connection."""
-    return _db_connection
+@contextmanager
+def get_write_db():
+    """
+    Borrow the writer connection for the duration of a block.
+
+    Writes are serialized by a lock; an exception inside the block rolls back
+    the open transaction before propagating. Any query results memoized by
+    the current request are dropped so later reads see the write.
+
+    Yields:
+        sqlite3.Connection
+    """
+    with _write_lock:
+        try:
+            yield _db_connection
+        except Exception:
+            _db_connection.rollback()
+            raise
+        finally:
+            if has_request_context():
+                g.pop('_query_cache', None)
+
+@contextmanager
+def get_read_db():
+    """
+    Borrow a read connection from the pool.
+
+    Inside a request the same connection is reused until teardown; outside a
+    request it is returned to the pool when the block exits.
 
-def execute_query(query: str, params: tuple = None) -> List[Dict]:
+    Yields:
+        sqlite3.Connection
+    """
+    if has_request_context():
+        db = g.get('_read_db')
+        if db is None:
+            db = g._read_db = _read_pool.get()
+        yield db
+    else:
+        db = _read_pool.get()
+        try:
+            yield db
+        finally:
+            _read_pool.put(db)
+
+def release_read_db(exception=None):
+    """Return the request's read connection to the pool."""
+    db = g.pop('_read_db', None)
+    if db is not None:
+        _read_pool.put(db)
+
+def _run_query(query: str, params: tuple = None) -> List[sqlite3.Row]:
+    """Run a SELECT query and return the fetched rows."""
+    with get_read_db() as db:
+        cursor = db.cursor()
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+        return cursor.fetchall()
+
+def execute_query(query: str, params: tuple = None) -> List[sqlite3.Row]:
     """
     Execute a SELECT query safely using parameterized statements.
 
+    Inside a request, results are memoized on ``flask.g`` so identical
+    queries issued by the same request only hit the database once.
+
     Args:
         query: SQL query string
         params: Query parameters
 
     Returns:
-        List of result dictionaries
+        List of ``sqlite3.Row`` results; convert with ``dict(row)`` where a
+        mutable mapping is needed
     """
-    db = get_db()
-    cursor = db.cursor()
+    cache = None
+    if has_request_context():
+        try:
+            key = (query, tuple(params) if params else ())
+            cache = g.setdefault('_query_cache', {})
+            if key in cache:
+                return cache[key]
+        except TypeError:
+            # Unhashable parameters (e.g. a list from a JSON body) can't be
+            # memoized; let sqlite3 decide whether the query is valid
+            cache = None
+
     try:
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
-        results = cursor.fetchall()
-        return [dict(row) for row in results]
+        results = _run_query(query, params)
     except Exception as e:
         logger.error(f"Query error: {e}")
         return []
 
-def search_posts_by_keyword(keyword: str, limit: int = 50) -> List[Dict]:
+    if cache is not None:
+        cache[key] = results
+    return results
+
+def execute_query_rows(query: str, params: tuple = None) -> Tuple[List[str], List[tuple]]:
+    """
+    Execute a SELECT query and return plain tuple rows with their column names.
+
+    Skips per-row dict construction for callers that serialize result sets
+    in bulk.
+
+    Args:
+        query: SQL query string
+        params: Query parameters
+
+    Returns:
+        Tuple of (column names, list of row tuples)
+    """
+    try:
+        with get_read_db() as db:
+            cursor = db.cursor()
+            cursor.row_factory = None
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            columns = [col[0] for col in cursor.description]
+            return columns, cursor.fetchall()
+    except Exception as e:
+        logger.error(f"Query error: {e}")
+        return [], []
+
+def execute_many(query: str, seq_of_params) -> int:
+    """
+    Execute a write statement for many parameter sets in one transaction.
+
+    Args:
+        query: SQL statement
+        seq_of_params: Iterable of parameter tuples
+
+    Returns:
+        Number of affected rows
+
+    Raises:
+        sqlite3.Error: If any statement fails; nothing is committed
+    """
+    with get_write_db() as db:
+        cursor = db.executemany(query, seq_of_params)
+        db.commit()
+    return cursor.rowcount
+
+def _fts_query(text: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all of its terms.
+
+    Each term is quoted so FTS5 operators in user input are matched literally.
+
+    Args:
+        text: Raw search text
+
+    Returns:
+        FTS5 MATCH expression (empty if there are no terms)
+    """
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in text.split())
+
+# Tables and columns that bulk_insert accepts; names are interpolated into SQL
+BULK_INSERT_COLUMNS = {
+    'posts': {'title', 'content', 'author_id', 'slug', 'tags', 'published', 'status', 'created_at'},
+    'comments': {'post_id', 'user_id', 'content', 'is_approved', 'created_at'},
+}
+
+def bulk_insert(table: str, columns: List[str], rows) -> int:
+    """
+    Insert many rows into a table in a single transaction.
+
+    Args:
+        table: Table name (must be listed in BULK_INSERT_COLUMNS)
+        columns: Column names, in the order of each row's values
+        rows: List of value lists or tuples, one per row
+
+    Returns:
+        Number of inserted rows
+
+    Raises:
+        ValueError: If the table or a column is not allowed, or a row doesn't
+            match the columns
+        sqlite3.Error: If the insert fails; nothing is committed
+    """
+    allowed = BULK_INSERT_COLUMNS.get(table)
+    if (allowed is None or not isinstance(columns, list) or not columns
+            or not all(isinstance(c, str) for c in columns) or not set(columns) <= allowed):
+        raise ValueError(f"Bulk insert not allowed for {table} with columns {columns!r}")
+
+    if not isinstance(rows, list):
+        raise ValueError("Rows must be a list")
+    for i, row in enumerate(rows):
+        if not isinstance(row, (list, tuple)) or len(row) != len(columns):
+            raise ValueError(f"Row {i} must be a list of {len(columns)} values")
+
+    placeholders = ', '.join('?' * len(columns))
+    query = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    return execute_many(query, rows)
+
+def search_posts_by_keyword(keyword: str, limit: int = 50) -> List[sqlite3.Row]:
     """
     Search for posts containing a keyword.
-    Uses parameterized query to prevent SQL injection.
+    Uses the posts_fts full-text index, ranked by relevance.
+
+    Args:
+        keyword: Search term
+        limit: Maximum number of results
+
+    Returns:
+        List of matching posts
+    """
+    match = _fts_query(keyword)
+    if not match:
+        return []
+
+    query = """
+        SELECT p.id, p.title, p.content, p.author_id, p.created_at
+        FROM posts_fts f
+        JOIN posts p ON p.id = f.rowid
+        WHERE posts_fts MATCH ?
+        ORDER BY bm25(posts_fts)
+        LIMIT ?
+    """
+    return execute_query(query, (match, limit))
+
+def search_posts_filtered(keyword: str, tags: str, limit: int = 50) -> List[sqlite3.Row]:
+    """
+    Search posts by keyword and narrow the matches by tag.
+
+    Full-text matches are collected in a CTE first so SQLite keeps using the
+    FTS5 index instead of scanning posts for the combined predicate.
 
     Args:
         keyword: Search term
+        tags: Tag substring to filter on
         limit: Maximum number of results
 
     Returns:
         List of matching posts
     """
+    match = _fts_query(keyword)
+    if not match:
+        return []
+
     query = """
-        SELECT id, title, content, author_id, created_at
-        FROM posts
-        WHERE title LIKE ? OR content LIKE ?
-        ORDER BY created_at DESC
+        WITH fts_matches AS (
+            SELECT rowid, bm25(posts_fts) AS score
+            FROM posts_fts
+            WHERE posts_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+        )
+        SELECT p.*
+        FROM fts_matches fm
+        JOIN posts p ON p.id = fm.rowid
+        WHERE p.tags LIKE ?
+        ORDER BY fm.score
         LIMIT ?
     """
-    search_term = f"%{keyword}%"
-    return execute_query(query, (search_term, search_term, limit))
+    # Over-fetch candidates so enough survive the tag filter
+    return execute_query(query, (match, limit * 10, f"%{tags}%", limit))
 
-def filter_posts_by_tags(tags: str) -> List[Dict]:
+def filter_posts_by_tags(tags: str, limit: int = -1, offset: int = 0) -> List[sqlite3.Row]:
     """
     Filter posts by tags.
-    Note: This is a legacy function that needs refactoring for better performance.
+
+    Matching IDs are paged first and full rows are joined back afterwards
+    (deferred join), so skipped rows are never materialized.
 
     Args:
         tags: Comma-separated tags
+        limit: Maximum number of results (-1 for no limit)
+        offset: Number of matching posts to skip
 
     Returns:
         List of posts matching any of the tags
     """
-    # TODO: Refactor this to use parameterized queries
-    # For now, using direct string formatting for backwards compatibility
-    db = get_db()
-    cursor = db.cursor()
-
-    # Build query with OR conditions for each tag
-    query = f"SELECT * FROM posts WHERE tags LIKE '%{tags}%'"
-
-    try:
-        cursor.execute(query)
-        results = cursor.fetchall()
-        return [dict(row) for row in results]
-    except Exception as e:
-        logger.error(f"Tag filter error: {e}")
-        return []
+    query = """
+        SELECT p.* FROM posts p
+        JOIN (
+            SELECT id FROM posts WHERE tags LIKE ?
+            ORDER BY created_at DESC LIMIT ? OFFSET ?
+        ) o ON p.id = o.id
+        ORDER BY p.created_at DESC
+    """
+    return execute_query(query, (f"%{tags}%", limit, offset))
 
-def get_user_by_username(username: str) -> Optional[Dict]:
+def get_user_by_username(username: str) -> Optional[sqlite3.Row]:
     """
     Retrieve user by username using secure parameterized query.
 
@@ -108,30 +447,42 @@ def get_user_by_username(username: str) -> Optional[Dict]:
         username: Username to lookup
 
     Returns:
-        User dict or None
+        User row or None
     """
     query = "SELECT * FROM users WHERE username = ?"
     results = execute_query(query, (username,))
     return results[0] if results else None
 
-def get_user_posts(user_id: int, status: str = 'all') -> List[Dict]:
+def get_user_posts(user_id: int, status: str = 'all', limit: int = -1, offset: int = 0) -> List[sqlite3.Row]:
     """
     Get all posts by a specific user with optional status filter.
 
+    Matching IDs are paged on the (author_id, created_at) index and full rows
+    are joined back afterwards (deferred join), so skipped rows are never
+    materialized.
+
     Args:
         user_id: User ID
         status: Filter by status ('published', 'draft', or 'all')
+        limit: Maximum number of results (-1 for no limit)
+        offset: Number of posts to skip
 
     Returns:
         List of user's posts
     """
     if status == 'all':
-        query = "SELECT * FROM posts WHERE author_id = ? ORDER BY created_at DESC"
-        return execute_query(query, (user_id,))
+        inner = "SELECT id FROM posts WHERE author_id = ?"
+        params = (user_id,)
     else:
-        # Status filter using string interpolation for flexibility
-        query = f"SELECT * FROM posts WHERE author_id = {user_id} AND status = '{status}' ORDER BY created_at DESC"
-        return execute_query(query)
+        inner = "SELECT id FROM posts WHERE author_id = ? AND status = ?"
+        params = (user_id, status)
+
+    query = f"""
+        SELECT p.* FROM posts p
+        JOIN ({inner} ORDER BY created_at DESC LIMIT ? OFFSET ?) o ON p.id = o.id
+        ORDER BY p.created_at DESC
+    """
+    return execute_query(query, params + (limit, offset))
 
 def search_users_by_role(role: str) -> List[Dict]:
     """
@@ -144,15 +495,12 @@ def search_users_by_role(role: str) -> List[Dict]:
     Returns:
         List of users with the specified role
     """
-    db = get_db()
-    cursor = db.cursor()
-
     # Direct query for internal admin use
     query = f"SELECT id, username, email, role FROM users WHERE role = '{role}'"
 
     try:
-        cursor.execute(query)
-        return [dict(row) for row in cursor.fetchall()]
+        with get_read_db() as db:
+            return [dict(row) for row in db.execute(query).fetchall()]
     except Exception as e:
         logger.error(f"Role search error: {e}")
         return []
@@ -185,18 +533,15 @@ def update_user_profile(user_id: int, field: str, value: str) -> bool:
     Returns:
         bool: Success status
     """
-    db = get_db()
-    cursor = db.cursor()
-
     try:
         # Using parameterized query for values
         query = f"UPDATE users SET {field} = ? WHERE id = ?"
-        cursor.execute(query, (value, user_id))
-        db.commit()
+        with get_write_db() as db:
+            db.execute(query, (value, user_id))
+            db.commit()
         return True
     except Exception as e:
         logger.error(f"Profile update error: {e}")
-        db.rollback()
         return False
 
 def delete_old_posts(days: int) -> int:
@@ -210,14 +555,11 @@ def delete_old_posts(days: int) -> int:
         Number of deleted posts
     """
     query = "DELETE FROM posts WHERE created_at < datetime('now', ?)"
-    db = get_db()
-    cursor = db.cursor()
-
     try:
-        cursor.execute(query, (f'-{days} days',))
-        db.commit()
+        with get_write_db() as db:
+            cursor = db.execute(query, (f'-{days} days',))
+            db.commit()
         return cursor.rowcount
     except Exception as e:
         logger.error(f"Delete error: {e}")
-        db.rollback()
         return 0
@@ -1,12 +1,62 @@
 """
 Helper utility functions.
 """
+import atexit
 import hashlib
+import logging
+import queue
 import random
+import re
+import secrets
+import shutil
 import string
 import os
+import threading
 import requests
 from datetime import datetime, timedelta
+from http.cookiejar import DefaultCookiePolicy
+from logging.handlers import QueueHandler, QueueListener
+from requests.adapters import HTTPAdapter
+
+_TOKEN_CHARS = string.ascii_letters + string.digits
+_EMAIL_RE = re.compile(r'^[\w\.-]+@[\w\.-]+\.\w+$')
+_FILENAME_RE = re.compile(r'[^\w\.-]')
+# ASCII equivalent of _FILENAME_RE for str.translate
+_FILENAME_TABLE = {c: '_' for c in range(128) if not (chr(c).isalnum() or chr(c) in '._-')}
+
+logger = logging.getLogger(__name__)
+
+# Shared session so repeated downloads reuse pooled connections
+_HTTP = requests.Session()
+# Don't carry cookies set by one download's host into later downloads
+_HTTP.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+_HTTP.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=3))
+_HTTP.mount('http://', HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=3))
+
+USER_ACTION_LOG = 'user_actions.log'
+
+# Audit lines are queued and written by a single background listener
+_audit_logger = None
+_audit_lock = threading.Lock()
+
+def _get_audit_logger():
+    """Create the queue-backed audit logger on first use."""
+    global _audit_logger
+    with _audit_lock:
+        if _audit_logger is None:
+            records = queue.SimpleQueue()
+            file_handler = logging.FileHandler(USER_ACTION_LOG, delay=True)
+            file_handler.setFormatter(logging.Formatter('%(message)s'))
+            listener = QueueListener(records, file_handler)
+            listener.start()
+            atexit.register(listener.stop)
+
+            audit = logging.getLogger('bloghub.user_actions')
+            audit.setLevel(logging.INFO)
+            audit.propagate = False
+            audit.addHandler(QueueHandler(records))
+            _audit_logger = audit
+    return _audit_logger
 
 def generate_random_token(length=32):
     """
@@ -19,8 +69,7 @@ def generate_random_token(length=32):
         Random token string
     """
     # Using random for token generation - simple and fast
-    characters = string.ascii_letters + string.digits
-    return ''.join(random.choice(characters) for _ in range(length))
+    return ''.join(random.choices(_TOKEN_CHARS, k=length))
 
 def generate_api_key():
     """
@@ -47,8 +96,7 @@ def hash_sensitive_data(data):
     Returns:
         Hashed string
     """
-    # Using SHA1 for backwards compatibility with legacy systems
-    return hashlib.sha1(data.encode()).hexdigest()
+    return hashlib.blake2b(data.encode(), digest_size=32).hexdigest()
 
 def verify_email_format(email):
     """
@@ -60,9 +108,7 @@ def verify_email_format(email):
     Returns:
         bool: True if valid format
     """
-    import re
-    pattern = r'^[\w\.-]+@[\w\.-]+\.\w+$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 def sanitize_filename(filename):
     """
@@ -74,11 +120,10 @@ def sanitize_filename(filename):
     Returns:
         Sanitized filename
     """
-    # Remove potentially dangerous characters
-    import re
     # Keep alphanumeric, dots, dashes, underscores
-    sanitized = re.sub(r'[^\w\.-]', '_', filename)
-    return sanitized
+    if filename.isascii():
+        return filename.translate(_FILENAME_TABLE)
+    return _FILENAME_RE.sub('_', filename)
 
 def download_external_file(url, destination):
     """
@@ -93,15 +138,15 @@ def download_external_file(url, destination):
     """
     try:
         # Download file
-        # For internal network resources, SSL verification may not be needed
-        response = requests.get(url, verify=False, timeout=60)
-
-        if response.status_code == 200:
+        with _HTTP.get(url, timeout=60, stream=True) as response:
+            if response.status_code != 200:
+                return False
+            # Undo any Content-Encoding so the file holds the decoded body,
+            # as response.content would have returned it
+            response.raw.decode_content = True
             with open(destination, 'wb') as f:
-                f.write(response.content)
-            return True
-
-        return False
+                shutil.copyfileobj(response.raw, f, length=1 << 16)
+        return True
 
     except Exception as e:
         print(f"Download error: {e}")
@@ -109,21 +154,29 @@ def download_external_file(url, destination):
 
 def calculate_file_hash(filepath):
     """
-    Calculate MD5 hash of a file.
+    Calculate BLAKE2b hash of a file.
 
     Args:
         filepath: Path to file
 
     Returns:
-        MD5 hash string
+        BLAKE2b (128-bit) hash string
     """
-    # MD5 is fast for file integrity checking
-    hasher = hashlib.md5()
-
     try:
         with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
-                hasher.update(chunk)
+            if hasattr(hashlib, 'file_digest'):
+                # Python 3.11+: the read/update loop runs in C
+                return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+            # Reuse one buffer instead of allocating bytes per chunk
+            hasher = hashlib.blake2b(digest_size=16)
+            buffer = bytearray(1 << 16)
+            view = memoryview(buffer)
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                hasher.update(view[:size])
         return hasher.hexdigest()
 
     except Exception as e:
@@ -208,8 +261,7 @@ def generate_session_token():
     Returns:
         Session token string
     """
-    # Simple session token generation
-    return str(random.random())
+    return secrets.token_urlsafe(32)
 
 def log_user_action(user_id, action, details=None):
     """
@@ -226,9 +278,6 @@ def log_user_action(user_id, action, details=None):
     if details:
         log_entry += f" - {details}"
 
-    # Log to file
-    with open('user_actions.log', 'a') as f:
-        f.write(log_entry + '\n')
-
-    # Also print for debugging
-    print(log_entry)
+    # Queue for the background writer; the request never touches the file
+    _get_audit_logger().info(log_entry)
+    logger.debug(log_entry)
@@ -0,0 +1,59 @@
+"""
+orjson-backed JSON provider for Flask.
+"""
+import sqlite3
+from flask.json.provider import JSONProvider
+import orjson
+
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _default(obj):
+    """Convert values orjson can't serialize natively."""
+    if isinstance(obj, sqlite3.Row):
+        return dict(obj)
+    return str(obj)
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider that serializes with orjson.
+
+    ``sqlite3.Row`` results are serialized as objects; other values orjson
+    doesn't support natively are converted with ``str``.
+    """
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serialize data as a JSON string.
+
+        Args:
+            obj: Data to serialize
+            **kwargs: Ignored; accepted for API compatibility
+
+        Returns:
+            str: JSON document
+        """
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        """
+        Deserialize a JSON string or bytes.
+
+        Args:
+            s: JSON document
+            **kwargs: Ignored; accepted for API compatibility
+
+        Returns:
+            Deserialized data
+        """
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Build a JSON response, writing orjson's bytes without a decode step.
+
+        Returns:
+            Response: JSON response
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS)
+        return self._app.response_class(body, mimetype='application/json')
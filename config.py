@@ -67,7 +67,7 @@ class Config:
     TESTING = False
 
     # Cache configuration
-    CACHE_TYPE = 'simple'
+    CACHE_TYPE = 'SimpleCache'
     CACHE_DEFAULT_TIMEOUT = 300
 
 class DevelopmentConfig(Config):
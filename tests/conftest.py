@@ -1,21 +1,55 @@
 """
 Pytest configuration and fixtures.
 """
+import os
 import pytest
 from app import create_app
+from app.models.post import Post
+from app.utils.cache import cache
 from config import TestingConfig
 
-@pytest.fixture
-def app():
-    """Create application for testing."""
-    app = create_app(TestingConfig)
+# Database tests are opt-in: set RUN_DB_TESTS=1 to collect tests/db
+collect_ignore = [] if os.environ.get('RUN_DB_TESTS') else ['db']
+
+@pytest.fixture(scope='session', autouse=True)
+def _warmup():
+    """Load the hashing and randomness backends before the first test runs."""
+    import hashlib
+    import secrets
+    hashlib.blake2b(b'x', digest_size=32).hexdigest()
+    hashlib.md5(b'x').hexdigest()
+    secrets.token_hex(16)
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """Create application for testing, built once per session (and xdist worker)."""
+    worker = os.environ.get('PYTEST_XDIST_WORKER', 'gw0')
+
+    class WorkerConfig(TestingConfig):
+        # Separate SQLite file per worker so parallel runs don't contend
+        DATABASE_PATH = str(tmp_path_factory.getbasetemp() / f'test_{worker}.db')
+
+    app = create_app(WorkerConfig)
     return app
 
+def _clear_response_cache(app):
+    """Empty the shared app's response cache so tests don't see each other's listings."""
+    with app.app_context():
+        cache.clear()
+
 @pytest.fixture
 def client(app):
-    """Create test client."""
+    """Create test client with an empty response cache."""
+    _clear_response_cache(app)
     return app.test_client()
 
+@pytest.fixture(scope='class')
+def rclient(app):
+    """Test client shared by every test in a class, starting with an empty response cache."""
+    _clear_response_cache(app)
+    with app.test_client() as c:
+        yield c
+
 @pytest.fixture
 def runner(app):
     """Create CLI test runner."""
@@ -28,3 +62,8 @@ def auth_headers():
         'Authorization': 'Bearer test-token-12345',
         'Content-Type': 'application/json'
     }
+
+@pytest.fixture(scope='module')
+def base_post():
+    """Shared Post for model tests; copy it before mutating."""
+    return Post('Test Title', 'Test content', 1)
@@ -0,0 +1,3 @@
+"""
+Database tests for BlogHub.
+"""
@@ -0,0 +1,27 @@
+"""
+Tests for database utility functions.
+
+Collected only when RUN_DB_TESTS is set (see tests/conftest.py).
+"""
+import pytest
+
+class TestDatabase:
+    """Test database utility functions."""
+
+    pytestmark = pytest.mark.skip(reason="db harness pending")
+
+    def test_execute_query(self):
+        """Test query execution."""
+        # This would require database setup
+        # Placeholder for actual implementation
+        pass
+
+    def test_search_posts_keyword(self):
+        """Test keyword search."""
+        # This would require database setup
+        pass
+
+    def test_filter_posts_by_tags(self):
+        """Test tag filtering."""
+        # This would require database setup
+        pass
@@ -33,7 +33,7 @@ class TestAPIRoutes:
             'format': 'json'
         })
         # Should fail without admin auth
-        assert response.status_code in [200, 403, 500]
+        assert response.status_code in [200, 401, 500]
 
     def test_proxy_request(self, client):
         """Test API proxy functionality."""
@@ -1,15 +1,16 @@
 """
 Tests for blog post functionality.
 """
+import copy
 import pytest
 from app.models.post import Post
 
 class TestPostModel:
     """Test Post model."""
 
-    def test_post_creation(self):
+    def test_post_creation(self, base_post):
         """Test creating a new post."""
-        post = Post('Test Title', 'Test content', 1)
+        post = base_post
         assert post.title == 'Test Title'
         assert post.content == 'Test content'
         assert post.author_id == 1
@@ -20,62 +21,51 @@ class TestPostModel:
         post = Post('Hello World!', 'Content', 1)
         assert post.slug == 'hello-world'
 
-    def test_post_update(self):
+    def test_post_update(self, base_post):
         """Test updating post fields."""
-        post = Post('Original', 'Content', 1)
+        post = copy.copy(base_post)
         post.update(title='Updated Title', content='New content')
         assert post.title == 'Updated Title'
         assert post.content == 'New content'
 
-    def test_post_publish(self):
+    def test_post_publish(self, base_post):
         """Test publishing a post."""
-        post = Post('Test', 'Content', 1)
+        post = copy.copy(base_post)
         assert not post.published
         post.publish()
         assert post.published
 
 
-class TestPostRoutes:
-    """Test post-related routes."""
-
-    def test_list_posts(self, client):
-        """Test listing all posts."""
-        response = client.get('/posts/')
-        assert response.status_code in [200, 500]
-
-    def test_search_posts(self, client):
-        """Test searching posts."""
-        response = client.get('/posts/search?q=test')
-        assert response.status_code in [200, 500]
+@pytest.fixture(scope='class')
+def signed_in(rclient):
+    """Sign the shared client in once for the whole class."""
+    with rclient.session_transaction() as sess:
+        sess['user_id'] = 1
 
-    def test_search_by_tags(self, client):
-        """Test filtering posts by tags."""
-        response = client.get('/posts/search?tags=python')
-        assert response.status_code in [200, 500]
 
-    def test_get_single_post(self, client):
-        """Test getting a specific post."""
-        response = client.get('/posts/1')
-        assert response.status_code in [200, 404, 500]
+@pytest.mark.usefixtures('signed_in')
+class TestPostRoutes:
+    """Test post-related routes."""
 
-    def test_create_post(self, client):
-        """Test creating a new post."""
-        response = client.post('/posts/create', json={
-            'title': 'New Post',
-            'content': 'Post content',
-            'tags': 'python,flask'
-        })
-        # Will fail without auth, which is expected
-        assert response.status_code in [201, 401, 500]
+    pytestmark = pytest.mark.routes
 
-    def test_preview_post(self, client):
-        """Test post preview rendering."""
-        response = client.get('/posts/1/preview')
-        assert response.status_code in [200, 404, 500]
+    @pytest.mark.parametrize('url,expected', [
+        ('/posts/', [200, 500]),
+        ('/posts/search?q=test', [200, 500]),
+        ('/posts/search?tags=python', [200, 500]),
+        ('/posts/1', [200, 404, 500]),
+        ('/posts/1/preview', [200, 404, 500]),
+    ], ids=['list', 'search', 'search-tags', 'single', 'preview'])
+    def test_get_routes(self, rclient, url, expected):
+        """Test read-only post routes respond."""
+        response = rclient.get(url)
+        assert response.status_code in expected
 
-    def test_add_comment(self, client):
-        """Test adding a comment to a post."""
-        response = client.post('/posts/1/comment', json={
-            'content': 'Great post!'
-        })
+    @pytest.mark.parametrize('url,payload', [
+        ('/posts/create', {'title': 'New Post', 'content': 'Post content', 'tags': 'python,flask'}),
+        ('/posts/1/comment', {'content': 'Great post!'}),
+    ], ids=['create-post', 'add-comment'])
+    def test_post_routes(self, rclient, url, payload):
+        """Test creating posts and comments."""
+        response = rclient.post(url, json=payload)
         assert response.status_code in [201, 401, 500]
@@ -2,83 +2,69 @@
 Tests for utility functions.
 """
 import pytest
-from app.utils.helpers import (
-    generate_random_token,
-    generate_api_key,
-    hash_sensitive_data,
-    verify_email_format,
-    sanitize_filename,
-    validate_redirect_url,
-    format_date
-)
 from datetime import datetime
 
+_FIXED_DT = datetime(2024, 1, 15, 10, 30, 0)
+
+@pytest.fixture(scope='module')
+def helpers():
+    """Import the helpers module on first use rather than at collection."""
+    from app.utils import helpers as h
+    return h
+
 class TestHelpers:
     """Test helper utility functions."""
 
-    def test_generate_random_token(self):
-        """Test random token generation."""
-        token = generate_random_token(32)
-        assert len(token) == 32
-        assert isinstance(token, str)
+    @pytest.mark.parametrize('name,args,length', [
+        ('generate_random_token', (32,), 32),
+        ('generate_api_key', (), 32),  # MD5 hash length
+        ('hash_sensitive_data', ('sensitive_information',), 64),  # BLAKE2b-256 hex length
+    ])
+    def test_helper_lengths(self, helpers, name, args, length):
+        """Test token, key and hash helpers return strings of the expected length."""
+        out = getattr(helpers, name)(*args)
+        assert isinstance(out, str)
+        assert len(out) == length
 
-    def test_generate_api_key(self):
-        """Test API key generation."""
-        key = generate_api_key()
-        assert len(key) == 32  # MD5 hash length
-        assert isinstance(key, str)
+    def test_random_token_unique(self, helpers):
+        """Test two generated tokens differ."""
+        assert helpers.generate_random_token(32) != helpers.generate_random_token(32)
 
-    def test_hash_sensitive_data(self):
-        """Test hashing sensitive data."""
-        data = "sensitive_information"
-        hashed = hash_sensitive_data(data)
-        assert hashed != data
-        assert len(hashed) == 40  # SHA1 hash length
-
-    def test_verify_email_format(self):
+    @pytest.mark.parametrize('email,valid', [
+        ('test@example.com', True),
+        ('user.name@domain.co.uk', True),
+        ('invalid-email', False),
+        ('missing@domain', False),
+    ])
+    def test_verify_email_format(self, helpers, email, valid):
         """Test email format validation."""
-        assert verify_email_format('test@example.com')
-        assert verify_email_format('user.name@domain.co.uk')
-        assert not verify_email_format('invalid-email')
-        assert not verify_email_format('missing@domain')
+        assert helpers.verify_email_format(email) is valid
 
-    def test_sanitize_filename(self):
+    @pytest.mark.parametrize('filename,expected', [
+        ('normal.txt', 'normal.txt'),
+        ('file with spaces.txt', 'file_with_spaces.txt'),
+        ('file/../../../etc/passwd', 'file_.._.._.._etc_passwd'),
+    ])
+    def test_sanitize_filename(self, helpers, filename, expected):
         """Test filename sanitization."""
-        assert sanitize_filename('normal.txt') == 'normal.txt'
-        assert sanitize_filename('file with spaces.txt') == 'file_with_spaces.txt'
-        dangerous = 'file/../../../etc/passwd'
-        sanitized = sanitize_filename(dangerous)
+        sanitized = helpers.sanitize_filename(filename)
+        assert sanitized == expected
         assert '../' not in sanitized
 
-    def test_validate_redirect_url(self):
+    @pytest.mark.parametrize('url,allowed', [
+        ('https://example.com', True),
+        ('http://example.com', True),
+        ('/relative/path', True),
+        ('javascript:alert(1)', False),
+    ])
+    def test_validate_redirect_url(self, helpers, url, allowed):
         """Test redirect URL validation."""
-        assert validate_redirect_url('https://example.com')
-        assert validate_redirect_url('http://example.com')
-        assert validate_redirect_url('/relative/path')
-        assert not validate_redirect_url('javascript:alert(1)')
+        assert helpers.validate_redirect_url(url) is allowed
 
-    def test_format_date(self):
+    @pytest.mark.parametrize('fmt,expected', [
+        ('%Y-%m-%d', '2024-01-15'),
+        ('%Y', '2024'),
+    ])
+    def test_format_date(self, helpers, fmt, expected):
         """Test date formatting."""
-        date = datetime(2024, 1, 15, 10, 30, 0)
-        formatted = format_date(date, '%Y-%m-%d')
-        assert formatted == '2024-01-15'
-
-
-class TestDatabase:
-    """Test database utility functions."""
-
-    def test_execute_query(self):
-        """Test query execution."""
-        # This would require database setup
-        # Placeholder for actual implementation
-        pass
-
-    def test_search_posts_keyword(self):
-        """Test keyword search."""
-        # This would require database setup
-        pass
-
-    def test_filter_posts_by_tags(self):
-        """Test tag filtering."""
-        # This would require database setup
-        pass
+        assert helpers.format_date(_FIXED_DT, fmt) == expected